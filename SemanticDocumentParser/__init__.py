@@ -1 +1,2 @@
-from .parser import SemanticDocumentParser
\ No newline at end of file
+from .parser import SemanticDocumentParser
+from .semantic_cache import SemanticCache
\ No newline at end of file
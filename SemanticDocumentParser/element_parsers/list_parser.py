@@ -1,7 +1,17 @@
-from typing import List, Optional, Generator
+from typing import List, Optional, Generator, Iterable, Dict
 
 from unstructured.documents.elements import Element, ListItem, NarrativeText, Title, PageBreak
 
+# Dispatch on the exact element type with a single dict lookup instead of repeated isinstance checks
+_OTHER, _LIST_ITEM, _NARRATIVE_TEXT, _TITLE, _PAGE_BREAK = range(5)
+
+_TAG: Dict[type, int] = {
+    ListItem: _LIST_ITEM,
+    NarrativeText: _NARRATIVE_TEXT,
+    Title: _TITLE,
+    PageBreak: _PAGE_BREAK
+}
+
 
 def _list_group_parser(elements: List[ListItem], header_node: Optional[NarrativeText]) -> List[NarrativeText]:
     """
@@ -13,30 +23,27 @@ def _list_group_parser(elements: List[ListItem], header_node: Optional[Narrative
 
     """
 
-    nodes: List[NarrativeText] = []
     header_text: str = header_node.text + "\n\n" if header_node else ""
     footer_text: str = f" There were {len(elements)} items."
 
-    # Create an overall node with everything in it
-    nodes.append(
+    # Create an overall node with everything in it, then NarrativeText elements from each ListItem
+    nodes: List[NarrativeText] = [
         NarrativeText(
-            text=header_text + "\n".join(["- " + element.text for element in elements]) + footer_text,
-        )
-    )
-
-    # Create NarrativeText elements from each ListItem
-    for idx, element in enumerate(elements):
-        nodes.append(
+            text=header_text + "\n".join(f"- {element.text}" for element in elements) + footer_text,
+        ),
+        *(
             NarrativeText(
-                text=header_text + f"List Item #{idx + 1}): " + element.text,
+                text=f"{header_text}List Item #{idx + 1}): {element.text}",
                 metadata=element.metadata,
             )
+            for idx, element in enumerate(elements)
         )
+    ]
 
     return nodes
 
 
-def _iterate_without_page_breaks(elements: List[Element]) -> Generator[Element, None, None]:
+def _iterate_without_page_breaks(elements: Iterable[Element]) -> Generator[Element, None, None]:
     """
     Remove page breaks using a cheeky generator method. Necessary for list parser across multiple pages.
 
@@ -46,49 +53,65 @@ def _iterate_without_page_breaks(elements: List[Element]) -> Generator[Element,
     """
 
     for element in elements:
-        if isinstance(element, PageBreak):
+        if type(element) is PageBreak:
             continue
         yield element
 
 
-def list_parser(elements: List[Element]) -> List[Element]:
+def _iter_list_parser(elements: Iterable[Element]) -> Generator[Element, None, None]:
     """
-    Each item in a list is its own semantic unit of information.
-
-    Lists should be represented in their TOTAL form, but also with individual items.
+    Lazy variant of list_parser. Nodes are yielded as they are parsed, so the next stage can consume them in the
+    same traversal.
 
     :param elements: All elements of a document
     :return: Elements with lists nodes enhanced properly and converted to NarrativeText
 
     """
 
-    nodes: List[Element] = []
-
     header_node: Optional[Element] = None
 
     list_group: List[ListItem] = []
     last_node: Optional[Element] = None
+    last_tag: int = _OTHER
 
     for element in _iterate_without_page_breaks(elements):
+        tag: int = _TAG.get(type(element), _OTHER)
 
         # If it's a list item then add it to the current group
-        if isinstance(element, ListItem):
+        if tag == _LIST_ITEM:
             list_group.append(element)
 
             # If the last node was text & now it's a list, set the header node
-            if isinstance(last_node, NarrativeText) or isinstance(last_node, Title):
+            if last_tag == _NARRATIVE_TEXT or last_tag == _TITLE:
                 header_node = last_node
 
         else:
             # If not a list item just add it directly
-            nodes.append(element)
+            yield element
 
             # If the last node was a list node & now it isn't, run the parser
-            if isinstance(last_node, ListItem):
-                nodes.extend(_list_group_parser(list_group, header_node))
+            if last_tag == _LIST_ITEM:
+                yield from _list_group_parser(list_group, header_node)
                 list_group = []
                 header_node = None
 
         last_node = element
+        last_tag = tag
 
-    return nodes
+    # A list may end the document
+    if list_group:
+        yield from _list_group_parser(list_group, header_node)
+
+
+def list_parser(elements: List[Element]) -> List[Element]:
+    """
+    Each item in a list is its own semantic unit of information.
+
+    Lists should be represented in their TOTAL form, but also with individual items.
+
+    :param elements: All elements of a document
+    :return: Elements with lists nodes enhanced properly and converted to NarrativeText
+
+    """
+
+    return list(_iter_list_parser(elements))
@@ -1,8 +1,36 @@
-from typing import List
+from typing import List, Iterable, Generator
 
 from unstructured.documents.elements import Element
 
 
+def _rewrite_links_by_index(text: str, links: List[dict]) -> str:
+    """
+    Embed the link URLs by slicing the text at each link's start index
+
+    :param text: The element text
+    :param links: The element links
+    :return: The rewritten text
+
+    """
+
+    parts: List[str] = []
+    position: int = 0
+
+    for link in sorted(links, key=lambda item: item['start_index']):
+        # Deconstruct dict
+        start_index: int = link['start_index']
+        link_text: str = link['text']
+
+        # Copy up to & including the link text, then the embedded language
+        parts.append(text[position:start_index])
+        parts.append(link_text)
+        parts.append(f" (The link URL is {link['url']})")
+        position = start_index + len(link_text)
+
+    parts.append(text[position:])
+    return "".join(parts)
+
+
 def _parse_element_urls(element: Element) -> None:
     """
     Replace the URL in-text into the element. In-place modification of element.
@@ -14,18 +42,7 @@ def _parse_element_urls(element: Element) -> None:
 
     """
 
-    change_delta: int = 0
-
-    for link in element.metadata.links:
-        # Deconstruct dict
-        start_index: int = link['start_index'] + change_delta
-        link_text: str = link['text']
-        end_index: int = start_index + len(link_text)
-
-        # Create the embedded language
-        new_text = f" (The link URL is {link['url']})"
-        change_delta += len(new_text)
-        element.text = element.text[:start_index] + link_text + new_text + element.text[end_index:]
+    element.text = _rewrite_links_by_index(element.text, element.metadata.links)
 
     # No need for those anymore!
     element.metadata.link_texts = None
@@ -33,13 +50,13 @@ def _parse_element_urls(element: Element) -> None:
     element.metadata.link_urls = None
 
 
-def metadata_parser(elements: List[Element]) -> None:
+def _iter_metadata_parser(elements: Iterable[Element]) -> Generator[Element, None, None]:
     """
-    Extract hyperlinks and substitute them in natural language. In-place modification of array.
-    Remove extra metadata fields that are unnecessary and annoying to debug with.
+    Lazy variant of metadata_parser. Elements are cleaned as they are yielded, so the next stage can consume them
+    in the same traversal.
 
     :param elements: Element list
-    :return: None
+    :return: The cleaned elements
 
     """
 
@@ -58,5 +75,21 @@ def metadata_parser(elements: List[Element]) -> None:
         element.metadata.languages = None
         element.metadata.page_number = None
 
+        yield element
+
+
+def metadata_parser(elements: List[Element]) -> None:
+    """
+    Extract hyperlinks and substitute them in natural language. In-place modification of array.
+    Remove extra metadata fields that are unnecessary and annoying to debug with.
+
+    :param elements: Element list
+    :return: None
+
+    """
+
+    for _ in _iter_metadata_parser(elements):
+        pass
+
 
 __all__ = ["metadata_parser"]
@@ -1,84 +1,149 @@
 import asyncio
 import functools
-from typing import List, TypedDict, Optional
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Dict, Iterable
 
 from llama_index.core.node_parser import SemanticSplitterNodeParser
 from llama_index.core.schema import TextNode, Document
 from unstructured.documents.elements import Element, Title, NarrativeText
 
 
-class ElementGroup(TypedDict):
+@dataclass
+class ElementGroup:
     """Groups of elements split by consecutive Title objects"""
 
+    # Declared by hand rather than with slots=True, which needs Python 3.10
+    __slots__ = ('title_node', 'nodes')
+
     title_node: Optional[Title]
     nodes: List[Element]
 
 
-def _create_element_groups(elements: List[Element]) -> List[ElementGroup]:
+def _create_element_groups(
+        elements: Iterable[Element]
+) -> Tuple[List[ElementGroup], List[Tuple[int, int, Document]]]:
     """
     Create element groups between Title elements.
 
     Elements between Titles represent semantically different units of information, so we have a guaranteed
     semantic boundary we can exploit in chunking.
 
+    Every NarrativeText is also collected as a Llama-Index Document in the same pass, so they can be split together.
+    Repeated paragraphs (headers, footers, boilerplate) share a single Document so they're only embedded once.
+
     :param elements: The element array
-    :return: The grouped elements
+    :return: The grouped elements & the (group index, node index, document) of each NarrativeText
 
     """
 
     element_groups: List[ElementGroup] = []
-    current_group = None
+    splittable_nodes: List[Tuple[int, int, Document]] = []
+    documents: Dict[bytes, Document] = {}
+
+    # Elements before the first Title get a group without a title
+    current_group: ElementGroup = ElementGroup(title_node=None, nodes=[])
 
     # Parse groups
     for element in elements:
 
         if isinstance(element, Title):
-            if current_group:
+            if current_group.title_node or current_group.nodes:
                 element_groups.append(current_group)
 
             current_group = ElementGroup(title_node=element, nodes=[])
+            continue
+
+        # Other node types can be parsed as their own semantic units
+        if isinstance(element, NarrativeText):
+            text_hash: bytes = hashlib.sha256(" ".join(element.text.split()).encode()).digest()
+
+            # Note: Uses a Llama-Index Document type
+            if text_hash not in documents:
+                documents[text_hash] = Document(text=element.text)
 
-        elif current_group is not None:
-            current_group['nodes'].append(element)
+            splittable_nodes.append(
+                (len(element_groups), len(current_group.nodes), documents[text_hash])
+            )
+
+        current_group.nodes.append(element)
 
     # Get rid of the remaining group
-    if bool(current_group):
+    if current_group.title_node or current_group.nodes:
         element_groups.append(current_group)
 
-    # If no groups, then return the original list
-    return element_groups if element_groups else elements
+    return element_groups, splittable_nodes
 
 
-async def _semantic_split_node(
-        title_node: Optional[Title],
-        node: NarrativeText,
-        node_parser: SemanticSplitterNodeParser
-) -> List[NarrativeText]:
+async def _semantic_split_document(
+        document: Document,
+        node_parser: SemanticSplitterNodeParser,
+        semaphore: asyncio.Semaphore
+) -> List[TextNode]:
     """
-    Run semantic splitting on each text node to subdivide bulky paragraphs into semantic units
+    Run semantic splitting on a text node to subdivide bulky paragraphs into semantic units
 
-    :param title_node: The Title the node falls under
-    :param node: The node to parse
+    :param document: The document to split
     :param node_parser: The node parser to use
-    :return: The unstructured NarrativeText elements
+    :param semaphore: Bounds the number of concurrent splits
+    :return: The Llama-Index nodes produced from the document
 
     """
 
-    # Note: Uses a Llama-Index Document type
-    document: Document = Document(
-        text=node.text
-    )
-
     # Note: Produces Llama-Index nodes
-    llama_nodes: List[TextNode] = await asyncio.to_thread(
-        functools.partial(
-            node_parser.build_semantic_nodes_from_documents,
-            documents=[document]
+    async with semaphore:
+        return await asyncio.to_thread(
+            functools.partial(
+                node_parser.build_semantic_nodes_from_documents,
+                documents=[document]
+            )
         )
+
+
+async def _semantic_split_documents(
+        documents: List[Document],
+        node_parser: SemanticSplitterNodeParser,
+        split_concurrency: int
+) -> Dict[str, List[TextNode]]:
+    """
+    Run semantic splitting on every text node concurrently
+
+    Note: The node parser embeds each document separately, so every document costs its own embedding call.
+
+    :param documents: The documents to split
+    :param node_parser: The node parser to use
+    :param split_concurrency: The maximum number of documents split at once
+    :return: The Llama-Index nodes produced from each document, by document ID
+
+    """
+
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(split_concurrency)
+
+    llama_nodes: List[List[TextNode]] = await asyncio.gather(
+        *[_semantic_split_document(document, node_parser, semaphore) for document in documents]
     )
 
+    return {document.doc_id: nodes for document, nodes in zip(documents, llama_nodes)}
+
+
+def _semantic_split_node(
+        title_node: Optional[Title],
+        node: NarrativeText,
+        llama_nodes: List[TextNode]
+) -> List[NarrativeText]:
+    """
+    Regenerate the NarrativeText elements of a semantically split text node
+
+    :param title_node: The Title the node falls under
+    :param node: The node that was split
+    :param llama_nodes: The Llama-Index nodes the node was split into
+    :return: The unstructured NarrativeText elements
+
+    """
+
     elements: List[NarrativeText] = []
     title_text: str = title_node.text if title_node else ""
+
     # Regenerate NarrativeText elements
     for llama_node in llama_nodes:
 
@@ -93,39 +158,41 @@ async def _semantic_split_node(
     return elements
 
 
-async def _semantic_split_element_group(
+def _semantic_split_element_group(
         group: ElementGroup,
-        node_parser: SemanticSplitterNodeParser
-):
+        node_splits: Dict[int, List[TextNode]]
+) -> List[Element]:
     """
     Process an element group. Semantically split paragraphs into further nodes.
 
     :param group: The element group to process
+    :param node_splits: The Llama-Index nodes each NarrativeText was split into, by node index
     :return: The 1D processed node split
 
     """
 
     # First represent the entire group itself, in case that provides more complete meaning
-    title_text: str = group['title_node'].text + "\n\n" if group['title_node'] else ""
+    title_text: str = group.title_node.text + "\n\n" if group.title_node else ""
 
     nodes: List[Element] = [
         NarrativeText(
-            text=title_text + " ".join([e.text for e in group['nodes']]),
+            text=title_text + " ".join([e.text for e in group.nodes]),
         )
     ]
 
-    for node in group['nodes']:
+    for node_idx, node in enumerate(group.nodes):
 
         # Other node types can be parsed as their own semantic units & just need to be passed on
         if not isinstance(node, NarrativeText):
+            nodes.append(node)
             continue
 
         # Add the splits
         nodes.extend(
-            await _semantic_split_node(
-                group['title_node'],
+            _semantic_split_node(
+                group.title_node,
                 node,
-                node_parser
+                node_splits.get(node_idx, [])
             )
         )
 
@@ -133,8 +200,9 @@ async def _semantic_split_element_group(
 
 
 async def semantic_splitter(
-        elements: List[Element],
-        node_parser: SemanticSplitterNodeParser
+        elements: Iterable[Element],
+        node_parser: SemanticSplitterNodeParser,
+        split_concurrency: int = 8
 ) -> List[Element]:
     """
 
@@ -142,9 +210,10 @@ async def semantic_splitter(
 
     The process roughly follows:
         1. Group by title elements
-        2. Run semantic splitting within each group
-            i. By grouping consecutive NarrativeTexts
-            ii. By running semantic splitting WITHIN these chunks
+        2. Run semantic splitting on every distinct NarrativeText of the document concurrently
+        3. Rebuild each group
+            i. By representing the group as a whole
+            ii. By substituting each NarrativeText with its semantic splits
             iii. By returning a 1D array for each group that gets combined
 
     Edge Cases Handled:
@@ -152,21 +221,31 @@ async def semantic_splitter(
 
     :param node_parser: The parser used to semantically split NarrativeText elements
     :param elements: All elements in the document
+    :param split_concurrency: The maximum number of NarrativeTexts split at once
     :return: The new list of elements with relationships respected
 
     """
 
     # Split into groups between Title elements
-    element_groups: List[ElementGroup] = _create_element_groups(elements)
+    element_groups, splittable_nodes = _create_element_groups(elements)
+
+    # Split every distinct paragraph
+    document_nodes: Dict[str, List[TextNode]] = await _semantic_split_documents(
+        list({document.doc_id: document for _, _, document in splittable_nodes}.values()),
+        node_parser,
+        split_concurrency
+    )
+
+    # Look up the splits of each node by its position
+    group_splits: List[Dict[int, List[TextNode]]] = [{} for _ in element_groups]
+
+    for group_idx, node_idx, document in splittable_nodes:
+        group_splits[group_idx][node_idx] = document_nodes.get(document.doc_id, [])
+
+    # Add them to the 1D array
     nodes: List[Element] = []
 
-    for group in element_groups:
-        # Add them to the 1D array
-        nodes.extend(
-            await _semantic_split_element_group(
-                group,
-                node_parser
-            )
-        )
+    for group, node_splits in zip(element_groups, group_splits):
+        nodes.extend(_semantic_split_element_group(group, node_splits))
 
     return nodes
@@ -1,17 +1,34 @@
 import asyncio
+import functools
 import json
 import logging
 import re
 import textwrap
 import traceback
 from json import JSONDecodeError
-from typing import List, Awaitable, Optional, Union
+from typing import List, Optional, Union, Iterable, AsyncGenerator, Tuple, Callable, Any
 
 from llama_index.core.base.llms.types import ChatResponse
 from llama_index.core.llms import LLM
 from llama_index_client import ChatMessage
 from unstructured.documents.elements import Element, Table, NarrativeText, Title
 
+from SemanticDocumentParser.semantic_cache import SemanticCache, TableCacheEntry
+
+# orjson is optional, but parses large table replies much faster
+try:
+    import orjson
+
+    _json_loads: Callable[[str], Any] = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Strips the tags from table HTML for the raw copy of the table
+_TAG_RE: re.Pattern = re.compile(r'<[^>]+>')
+
+# Elements that can describe the table that follows them
+_TEXTY: Tuple[type, ...] = (NarrativeText, Title)
+
 SemanticUnitsTemplate: ChatMessage = ChatMessage(
     role="system",
     additional_kwargs={},
@@ -51,6 +68,10 @@ SemanticSummaryTemplate: ChatMessage = ChatMessage(
 )
 
 
+class TableParseError(ValueError):
+    """The LLM replied with valid JSON that isn't a list of strings"""
+
+
 def _parse_llm_json_response(response: ChatResponse) -> list[str]:
     """
     Parse the LLM's JSON response. We must make sure it replied exactly how it should.
@@ -61,11 +82,18 @@ def _parse_llm_json_response(response: ChatResponse) -> list[str]:
     """
 
     try:
-        element_texts: list[str] = json.loads(response.message.content)
-        if not isinstance(element_texts[0], str):
-            raise JSONDecodeError("LLM returned invalid JSON string for Table", response.message.content, 0)
+        # Note: orjson.JSONDecodeError subclasses json.JSONDecodeError
+        element_texts: list[str] = _json_loads(response.message.content)
+
+        if not isinstance(element_texts, list):
+            raise TableParseError("LLM returned a JSON value that isn't a list for Table")
+
+        for idx, element_text in enumerate(element_texts):
+            if not isinstance(element_text, str):
+                raise TableParseError(f"LLM returned a non-string JSON value at index {idx} for Table")
+
         return element_texts
-    except JSONDecodeError:
+    except (JSONDecodeError, TableParseError):
         logging.error(
             "Failed to parse a table! Got invalid reply: "
             + response.message.content + "\n"
@@ -75,94 +103,116 @@ def _parse_llm_json_response(response: ChatResponse) -> list[str]:
 
 
 async def _semantic_summarize_table(
-        element: Table,
-        previous_element: Optional[Union[NarrativeText, Title]],
-        llm: LLM
-) -> NarrativeText:
+        table_message: ChatMessage,
+        llm: LLM,
+        semaphore: asyncio.Semaphore
+) -> str:
     """
     Given a Python table, semantically summarize the elements in the table using an LLM
 
-    :param element: The table to summarize
-    :param previous_element: The previous element in the table
+    :param table_message: The user message containing the table to summarize
     :param llm: The LLM used for the summary task
-    :return: The summary elements
+    :param semaphore: Bounds the number of concurrent LLM calls
+    :return: The summary text
 
     """
 
     # Query the LLM using Llama-Index
-    response: ChatResponse = await llm.achat(
-        messages=(
-            [
-                SemanticSummaryTemplate,
-                ChatMessage(
-                    role="user",
-                    content=element.metadata.text_as_html,
-                    additional_kwargs={}
-                )
-            ]
+    async with semaphore:
+        response: ChatResponse = await llm.achat(
+            messages=(SemanticSummaryTemplate, table_message)
         )
-    )
 
-    # Read the summary as JSON
-    element_header: str = previous_element.text + "\n" if previous_element else ""
-
-    # Generate the summary.
-    return NarrativeText(
-        text=element_header + response.message.content,
-        metadata=element.metadata
-    )
+    return response.message.content
 
 
 async def _semantic_parse_table(
-        element: Table,
-        previous_element: Optional[Union[NarrativeText, Title]],
-        llm: LLM
-) -> List[NarrativeText]:
+        table_message: ChatMessage,
+        llm: LLM,
+        semaphore: asyncio.Semaphore
+) -> list[str]:
     """
     Split a table into semantic units of information using GPT.
 
-    :param element: The element to parse
+    :param table_message: The user message containing the table to parse
     :param llm: The LLM used to parse the table
-    :return: The parsed table as elements
+    :param semaphore: Bounds the number of concurrent LLM calls
+    :return: The parsed table items
 
     """
 
     # Query the LLM using Llama-Index
-    response: ChatResponse = (
-        await llm.achat(
-            messages=(
-                [
-                    SemanticUnitsTemplate,
-                    ChatMessage(
-                        role="user",
-                        content=element.metadata.text_as_html,
-                        additional_kwargs={}
-                    )
-                ]
-            )
+    async with semaphore:
+        response: ChatResponse = await llm.achat(
+            messages=(SemanticUnitsTemplate, table_message)
         )
-    )
 
     # Parse the items in the table
-    element_texts: list[str] = _parse_llm_json_response(response)
-    elements: List[NarrativeText] = []
-    element_header: str = previous_element.text + "\n\n" if previous_element else ""
+    return _parse_llm_json_response(response)
 
-    for idx, element_text in enumerate(element_texts):
-        elements.append(
-            NarrativeText(
-                text=element_header + f"List Item {idx + 1}: {element_text}",
-                metadata=element.metadata
-            )
-        )
 
-    return elements
+async def _semantic_request_table(
+        element: Table,
+        llm: LLM,
+        semaphore: asyncio.Semaphore
+) -> TableCacheEntry:
+    """
+    Query the LLM for the parsed items & summary of a table.
+
+    :param element: The table to query
+    :param llm: The LLM used to parse the table
+    :param semaphore: Bounds the number of concurrent LLM calls
+    :return: The parsed table items & the summary text
+
+    """
+
+    # Both queries share the same table message
+    table_message: ChatMessage = ChatMessage(
+        role="user",
+        content=element.metadata.text_as_html,
+        additional_kwargs={}
+    )
+
+    element_texts, summary_text = await asyncio.gather(
+        _semantic_parse_table(table_message, llm, semaphore),
+        _semantic_summarize_table(table_message, llm, semaphore)
+    )
+
+    return element_texts, summary_text
+
+
+async def _semantic_query_table(
+        element: Table,
+        llm: LLM,
+        cache: Optional[SemanticCache],
+        semaphore: asyncio.Semaphore
+) -> TableCacheEntry:
+    """
+    Retrieve the parsed items & summary of a table, from the cache if an identical table was already parsed.
+
+    :param element: The table to query
+    :param llm: The LLM used to parse the table
+    :param cache: The cache of previous table replies, if any
+    :param semaphore: Bounds the number of concurrent LLM calls
+    :return: The parsed table items & the summary text
+
+    """
+
+    if cache is None:
+        return await _semantic_request_table(element, llm, semaphore)
+
+    return await cache.aget_or_create(
+        cache.key(element.metadata.text_as_html),
+        functools.partial(_semantic_request_table, element, llm, semaphore)
+    )
 
 
 async def _semantic_ingest_table(
         element: Table,
         previous_element: Optional[Union[NarrativeText, Title]],
-        llm: LLM
+        llm: LLM,
+        cache: Optional[SemanticCache],
+        semaphore: asyncio.Semaphore
 ) -> List[NarrativeText]:
     """
     Parse the table & create a summary of it. Also include a raw copy of the table.
@@ -170,6 +220,8 @@ async def _semantic_ingest_table(
     :param element: The element to parse
     :param previous_element: The previous element before the table, if it was a Title or NarrativeText
     :param llm: The LLM used to parse the table
+    :param cache: The cache of previous table replies, if any
+    :param semaphore: Bounds the number of concurrent LLM calls
     :return: List of NarrativeText elements generated from the table
 
     """
@@ -177,63 +229,99 @@ async def _semantic_ingest_table(
     elements: List[NarrativeText] = [
         NarrativeText(
             text=textwrap.dedent(
-                re.sub('<[^<]+?>', '', element.metadata.text_as_html)
+                _TAG_RE.sub('', element.metadata.text_as_html)
             ),
             metadata=element.metadata
         )
     ]
 
-    tasks: List[Awaitable] = [
-        _semantic_parse_table(element, previous_element, llm),
-        _semantic_summarize_table(element, previous_element, llm)
-    ]
+    # The previous element describes the table, computed once for every generated element
+    summary_header: str = previous_element.text + "\n" if previous_element else ""
+    item_header: str = summary_header + "\n" if previous_element else ""
 
-    results = await asyncio.gather(*tasks)
-    elements.extend(results[0])
-    elements.append(results[1])
+    element_texts, summary_text = await _semantic_query_table(element, llm, cache, semaphore)
+
+    # Add the parsed items of the table
+    for idx, element_text in enumerate(element_texts):
+        elements.append(
+            NarrativeText(
+                text=f"{item_header}List Item {idx + 1}: {element_text}",
+                metadata=element.metadata
+            )
+        )
+
+    # Add the summary
+    elements.append(
+        NarrativeText(
+            text=summary_header + summary_text,
+            metadata=element.metadata
+        )
+    )
 
     return elements
 
 
-async def semantic_tables(elements: List[Element], llm) -> List[Element]:
+async def semantic_tables(
+        elements: Iterable[Element],
+        llm: LLM,
+        cache: Optional[SemanticCache] = None,
+        llm_concurrency: int = 16
+) -> AsyncGenerator[Element, None]:
     """
     Semantically separate tables into natural language using an LLM
 
+    Non-table elements are yielded right away, then the elements of each table as soon as its LLM calls complete.
+
     :param elements: The elements in the table
     :param llm: The LLM to use for comprehension of the table
-    :return: The list of elements parsed from the table
+    :param cache: The cache of previous table replies, if any
+    :param llm_concurrency: The maximum number of LLM calls in flight at once
+    :return: The elements parsed from the table
 
     """
 
-    tasks: List[Awaitable] = []
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(llm_concurrency)
+
+    tasks: List[asyncio.Task] = []
     nodes: List[Element] = []
 
-    # Create the comprehension tasks
-    for idx, element in enumerate(elements):
+    last_node: Optional[Element] = None
+
+    # Start the comprehension tasks
+    for element in elements:
 
         if not isinstance(element, Table):
             nodes.append(element)
+            last_node = element
             continue
 
         previous_element: Optional[Element] = None
 
         # Only include if the previous node is a TITLE or TEXT element
-        if idx > 0:
-            if isinstance(elements[idx - 1], NarrativeText) or isinstance(elements[idx - 1], Title):
-                previous_element = elements[idx - 1]
+        if isinstance(last_node, _TEXTY):
+            previous_element = last_node
 
         # Add the task
         tasks.append(
-            _semantic_ingest_table(
-                element, previous_element, llm
+            asyncio.ensure_future(
+                _semantic_ingest_table(
+                    element, previous_element, llm, cache, semaphore
+                )
             )
         )
 
-    # Return the list as a 1D array
-    for item in await asyncio.gather(*tasks):
-        if isinstance(item, list):
-            nodes.extend(item)
-        else:
-            nodes.append(item)
+        last_node = element
 
-    return nodes
+    try:
+        # The tables are processed in the background in the meantime
+        for node in nodes:
+            yield node
+
+        for task in asyncio.as_completed(tasks):
+            for node in await task:
+                yield node
+
+    finally:
+        # Don't leave LLM calls running if the consumer stops early
+        for task in tasks:
+            task.cancel()
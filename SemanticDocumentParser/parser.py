@@ -1,25 +1,38 @@
+import asyncio
 import io
 import time
-from typing import List, Tuple, TypedDict, Optional
+from concurrent.futures import Executor
+from typing import List, Tuple, TypedDict, Optional, AsyncGenerator
 
 from llama_index.core.llms import LLM
 from llama_index.core.node_parser import SemanticSplitterNodeParser
-from pydantic.v1 import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from unstructured.documents.elements import Element
 from unstructured.partition.auto import partition
 
-from SemanticDocumentParser.element_parsers.list_parser import list_parser
-from SemanticDocumentParser.element_parsers.metadata_parser import metadata_parser
+from SemanticDocumentParser.element_parsers.list_parser import _iter_list_parser
+from SemanticDocumentParser.element_parsers.metadata_parser import _iter_metadata_parser
 from SemanticDocumentParser.element_parsers.semantic_splitter import semantic_splitter
 from SemanticDocumentParser.element_parsers.semantic_tables import semantic_tables
+from SemanticDocumentParser.semantic_cache import SemanticCache
 
 
 class SemanticDocumentParserStats(TypedDict):
-    element_parse_time: Optional[int]
-    metadata_parse_time: Optional[int]
-    paragraph_parse_time: Optional[int]
-    list_parse_time: Optional[int]
-    table_parse_time: Optional[int]
+    element_parse_time_ns: Optional[int]
+    paragraph_parse_time_ns: Optional[int]
+    table_parse_time_ns: Optional[int]
+
+
+def _partition_bytes(data: bytes) -> List[Element]:
+    """
+    Partition a document from its raw bytes. Top-level so it can be pickled into a process pool.
+
+    :param data: The document contents
+    :return: The document-agnostic elements
+
+    """
+
+    return partition(file=io.BytesIO(data))
 
 
 class SemanticDocumentParser(BaseModel):
@@ -30,62 +43,97 @@ class SemanticDocumentParser(BaseModel):
 
     llm_model: LLM
     node_parser: SemanticSplitterNodeParser
+    cache: Optional[SemanticCache] = None
+    partition_executor: Optional[Executor] = None
+    llm_concurrency: int = Field(16, ge=1)
+    split_concurrency: int = Field(8, ge=1)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    async def _partition(self, document: io.BytesIO) -> List[Element]:
+        """
+        Partition the document off the event loop. Uses the partition executor if one was provided (e.g. a
+        ProcessPoolExecutor for OCR-heavy files that hold the GIL), otherwise a worker thread.
+
+        :param document: The document to partition
+        :return: The document-agnostic elements
+
+        """
+
+        if self.partition_executor is None:
+            return await asyncio.to_thread(partition, file=document)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.partition_executor,
+            _partition_bytes,
+            document.getvalue()
+        )
 
     async def aparse(
             self,
-            document: io.BytesIO
-    ) -> Tuple[List[Element], SemanticDocumentParserStats]:
+            document: io.BytesIO,
+            stats: Optional[SemanticDocumentParserStats] = None
+    ) -> AsyncGenerator[Element, None]:
         """
-        Asynchronously (where possible) parse the document
+        Asynchronously (where possible) parse the document, yielding elements as soon as their stage completes
 
         :param document: The document to parse of any type unstructured supports
-        :return: A list of elements existing as distinct chunks of NarrativeText
+        :param stats: Filled with the time taken by each stage as it completes, if provided
+        :return: The elements existing as distinct chunks of NarrativeText
 
         """
 
+        if stats is None:
+            stats = SemanticDocumentParserStats()
+
+        stats.update(element_parse_time_ns=None, paragraph_parse_time_ns=None, table_parse_time_ns=None)
+
         # Generate the document-agnostic array
-        _1_start_time: int = int(time.time())
-        elements: List[Element] = partition(file=document)
-        _1_end_time: int = int(time.time())
+        _1_start_time: int = time.perf_counter_ns()
+        elements: List[Element] = await self._partition(document)
+        stats["element_parse_time_ns"] = time.perf_counter_ns() - _1_start_time
 
         # If there are no elements, don't run the parsers
         if len(elements) < 1:
-            stats: SemanticDocumentParserStats = {
-                "element_parse_time": _1_end_time - _1_start_time,
-                "metadata_parse_time": None,
-                "paragraph_parse_time": None,
-                "list_parse_time": None,
-                "table_parse_time": None
-            }
-
-            return [], stats
-
-        # Parse metadata
-        _2_start_time: int = int(time.time())
-        metadata_parser(elements)
-        _2_end_time: int = int(time.time())
-
-        # Group elements by Title separation & semantically deconstruct grouped NarrativeText elements
-        _3_start_time: int = int(time.time())
-        elements = await semantic_splitter(elements, self.node_parser)
-        _3_end_time: int = int(time.time())
-
-        # Group ListItem elements
-        _4_start_time: int = int(time.time())
-        elements = list_parser(elements)
-        _4_end_time: int = int(time.time())
-
-        _5_start_time: int = int(time.time())
-        elements = await semantic_tables(elements, self.llm_model)
-        _5_end_time: int = int(time.time())
-
-        stats: SemanticDocumentParserStats = {
-            "element_parse_time": _1_end_time - _1_start_time,
-            "metadata_parse_time": _2_end_time - _2_start_time,
-            "paragraph_parse_time": _3_end_time - _3_start_time,
-            "list_parse_time": _4_end_time - _4_start_time,
-            "table_parse_time": _5_end_time - _5_start_time,
-        }
+            return
+
+        # Parse metadata while grouping elements by Title separation & semantically deconstruct grouped NarrativeText
+        _2_start_time: int = time.perf_counter_ns()
+        elements = await semantic_splitter(
+            _iter_metadata_parser(elements),
+            self.node_parser,
+            self.split_concurrency
+        )
+        stats["paragraph_parse_time_ns"] = time.perf_counter_ns() - _2_start_time
+
+        # Group ListItem elements while semantically deconstructing tables
+        # Note: Includes the time the consumer spends between elements
+        _3_start_time: int = time.perf_counter_ns()
+
+        async for element in semantic_tables(
+                _iter_list_parser(elements),
+                self.llm_model,
+                self.cache,
+                self.llm_concurrency
+        ):
+            yield element
+
+        stats["table_parse_time_ns"] = time.perf_counter_ns() - _3_start_time
+
+    async def aparse_list(
+            self,
+            document: io.BytesIO
+    ) -> Tuple[List[Element], SemanticDocumentParserStats]:
+        """
+        Asynchronously (where possible) parse the document into a complete list
+
+        :param document: The document to parse of any type unstructured supports
+        :return: A list of elements existing as distinct chunks of NarrativeText, and the stage timings
+
+        """
+
+        stats: SemanticDocumentParserStats = SemanticDocumentParserStats()
+        elements: List[Element] = [element async for element in self.aparse(document, stats)]
 
         return elements, stats
 
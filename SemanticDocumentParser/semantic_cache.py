@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import re
+from typing import Dict, Optional, Tuple, Callable, Awaitable
+
+# A cached table reply: the parsed list items & the summary text
+TableCacheEntry = Tuple[list[str], str]
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+_OPEN_TAG_RE = re.compile(r'<([A-Za-z][\w:-]*)((?:\s+[^\s>]+)*)\s*(/?)>')
+_ATTRIBUTE_RE = re.compile(r'[^\s=]+(?:\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+))?')
+
+
+def _normalize_tag(match: re.Match) -> str:
+    """
+    Rebuild an opening tag with its attributes in sorted order
+
+    :param match: The opening tag match
+    :return: The normalized tag
+
+    """
+
+    name, attributes, self_closing = match.groups()
+    attributes = " ".join(sorted(_ATTRIBUTE_RE.findall(attributes or "")))
+    return "<" + name.lower() + (" " + attributes if attributes else "") + self_closing + ">"
+
+
+def normalize_html(html: str) -> str:
+    """
+    Normalize table HTML so that layout-only differences (whitespace, attribute order) hash identically
+
+    :param html: The HTML to normalize
+    :return: The normalized HTML
+
+    """
+
+    html = _WHITESPACE_RE.sub(" ", html.strip())
+    html = _BETWEEN_TAGS_RE.sub("><", html)
+    return _OPEN_TAG_RE.sub(_normalize_tag, html)
+
+
+class SemanticCache:
+    """
+    Exact-match cache for the LLM replies generated when parsing tables.
+
+    Entries are keyed by the SHA-256 of the normalized table HTML. The default backend is an in-process dict;
+    subclass and override `aget` / `aset` to share the cache between processes (e.g. Redis).
+
+    Identical tables requested while the first is still being parsed wait for its reply instead of querying the LLM.
+
+    """
+
+    def __init__(self):
+        self._store: Dict[str, TableCacheEntry] = {}
+        self._pending: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+    @staticmethod
+    def key(html: str) -> str:
+        """
+        Generate the cache key for a table
+
+        :param html: The table HTML
+        :return: The hex digest identifying the table
+
+        """
+
+        return hashlib.sha256(normalize_html(html).encode()).hexdigest()
+
+    async def aget(self, key: str) -> Optional[TableCacheEntry]:
+        """
+        Retrieve a cached table reply
+
+        :param key: The cache key
+        :return: The cached entry, if any
+
+        """
+
+        return self._store.get(key)
+
+    async def aset(self, key: str, entry: TableCacheEntry) -> None:
+        """
+        Store a table reply
+
+        :param key: The cache key
+        :param entry: The parsed list items & the summary text
+        :return: None
+
+        """
+
+        self._store[key] = entry
+
+    async def aget_or_create(self, key: str, create: Callable[[], Awaitable[TableCacheEntry]]) -> TableCacheEntry:
+        """
+        Retrieve a cached table reply, creating it if there is none.
+        Concurrent calls for the same key share a single creation. If that creation fails or is cancelled, the
+        waiting calls retry rather than inherit another caller's failure.
+
+        :param key: The cache key
+        :param create: Generates the reply on a miss
+        :return: The cached or created entry
+
+        """
+
+        # Futures belong to a loop, so creations are only shared within the same loop
+        pending_key: Tuple[asyncio.AbstractEventLoop, str] = (asyncio.get_running_loop(), key)
+
+        while True:
+
+            # Wait for an identical table that's already being parsed
+            if pending_key in self._pending:
+                pending: asyncio.Future = self._pending[pending_key]
+
+                try:
+                    return await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    # Only swallow the creator's cancellation, never our own
+                    if not pending.cancelled() or _is_cancelling():
+                        raise
+                    continue
+                except Exception:
+                    continue
+
+            entry: Optional[TableCacheEntry] = await self.aget(key)
+
+            if entry is not None:
+                return entry
+
+            # Another call may have started parsing while the backend was queried
+            if pending_key in self._pending:
+                continue
+
+            return await self._create(pending_key, key, create)
+
+    async def _create(
+            self,
+            pending_key: Tuple[asyncio.AbstractEventLoop, str],
+            key: str,
+            create: Callable[[], Awaitable[TableCacheEntry]]
+    ) -> TableCacheEntry:
+        """
+        Create a table reply while publishing it to concurrent calls for the same key
+
+        :param pending_key: The key of the creation in the pending map
+        :param key: The cache key
+        :param create: Generates the reply
+        :return: The created entry
+
+        """
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[pending_key] = future
+
+        try:
+            entry: TableCacheEntry = await create()
+
+            # Don't cache failed parses, they deserve another try
+            if entry[0]:
+                await self.aset(key, entry)
+
+            future.set_result(entry)
+            return entry
+
+        except BaseException as ex:
+            if isinstance(ex, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(ex)
+
+                # Mark the exception as retrieved in case nobody was waiting on it
+                future.exception()
+
+            raise
+
+        finally:
+            del self._pending[pending_key]
+
+
+def _is_cancelling() -> bool:
+    """
+    Whether the current task has a pending cancellation request (only detectable on Python 3.11+)
+
+    :return: True if the current task is being cancelled
+
+    """
+
+    task: Optional[asyncio.Task] = asyncio.current_task()
+    return bool(task is not None and hasattr(task, "cancelling") and task.cancelling())
+
+
+__all__ = ['SemanticCache', 'TableCacheEntry', 'normalize_html']
@@ -28,6 +28,9 @@ if __name__ == '__main__':
             "llama-index-core",
             "unstructured[all-docs]"
         ],
+        extras_require={
+            "orjson": ["orjson"]
+        },
         classifiers=[
             "Development Status :: 4 - Beta",
             "Intended Audience :: Developers",
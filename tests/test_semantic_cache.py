@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+
+from SemanticDocumentParser.semantic_cache import SemanticCache, TableCacheEntry
+
+
+class SemanticCacheTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_duplicates_share_one_creation(self):
+        cache: SemanticCache = SemanticCache()
+        calls: int = 0
+
+        async def create() -> TableCacheEntry:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return ["item"], "summary"
+
+        keys = [cache.key(f"<table><tr><td>{idx % 4}</td></tr></table>") for idx in range(21)]
+        entries = await asyncio.gather(*[cache.aget_or_create(key, create) for key in keys])
+
+        self.assertEqual(calls, 4)
+        self.assertEqual(len(entries), 21)
+
+    async def test_waiter_survives_creator_cancellation(self):
+        cache: SemanticCache = SemanticCache()
+        started: asyncio.Event = asyncio.Event()
+
+        async def slow_create() -> TableCacheEntry:
+            started.set()
+            await asyncio.sleep(10)
+            return ["first"], "summary"
+
+        async def create() -> TableCacheEntry:
+            return ["second"], "summary"
+
+        first: asyncio.Task = asyncio.create_task(cache.aget_or_create("key", slow_create))
+        await started.wait()
+
+        second: asyncio.Task = asyncio.create_task(cache.aget_or_create("key", create))
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        self.assertEqual(await second, (["second"], "summary"))
+        self.assertTrue(first.cancelled())
+
+    async def test_waiter_retries_after_creator_failure(self):
+        cache: SemanticCache = SemanticCache()
+        started: asyncio.Event = asyncio.Event()
+
+        async def failing_create() -> TableCacheEntry:
+            started.set()
+            await asyncio.sleep(0.01)
+            raise ConnectionError("transient")
+
+        async def create() -> TableCacheEntry:
+            return ["item"], "summary"
+
+        first: asyncio.Task = asyncio.create_task(cache.aget_or_create("key", failing_create))
+        await started.wait()
+        second: asyncio.Task = asyncio.create_task(cache.aget_or_create("key", create))
+
+        with self.assertRaises(ConnectionError):
+            await first
+
+        self.assertEqual(await second, (["item"], "summary"))
+
+    async def test_waiter_cancellation_is_not_swallowed(self):
+        cache: SemanticCache = SemanticCache()
+        started: asyncio.Event = asyncio.Event()
+
+        async def slow_create() -> TableCacheEntry:
+            started.set()
+            await asyncio.sleep(0.05)
+            return ["item"], "summary"
+
+        first: asyncio.Task = asyncio.create_task(cache.aget_or_create("key", slow_create))
+        await started.wait()
+        second: asyncio.Task = asyncio.create_task(cache.aget_or_create("key", slow_create))
+        await asyncio.sleep(0)
+
+        second.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await second
+
+        self.assertEqual(await first, (["item"], "summary"))
+
+
+if __name__ == '__main__':
+    unittest.main()